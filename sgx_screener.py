@@ -5,209 +5,425 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
+import json
+import os
+import tempfile
 import warnings
 from datetime import datetime, timedelta
-import time
+from pathlib import Path
+from types import MappingProxyType
+
+# Numba reads this at import time.
+# Prefer OpenMP for parallel kernels: Streamlit launches them from its script
+# threads, where the TBB layer can hang the process on exit.
+os.environ.setdefault('NUMBA_THREADING_LAYER_PRIORITY', 'omp tbb workqueue')
+from numba import njit, prange
 
 warnings.filterwarnings('ignore')
 
-class SGXStockScreener:
-    def __init__(self):
-        # Major SGX stocks with their tickers (sample list)
-        self.sgx_stocks = {
-            'DBS Group Holdings': 'D05.SI',
-            'OCBC Bank': 'O39.SI',
-            'United Overseas Bank': 'U11.SI',
-            'Singapore Airlines': 'C6L.SI',
-            'Singtel': 'Z74.SI',
-            'CapitaLand Investment': '9CI.SI',
-            'Wilmar International': 'F34.SI',
-            'Genting Singapore': 'G13.SI',
-            'City Developments': 'C09.SI',
-            'Keppel Corp': 'BN4.SI',
-            'ComfortDelGro': 'C52.SI',
-            'SembCorp Industries': 'U96.SI',
-            'Thai Beverage': 'Y92.SI',
-            'Jardine Matheson': 'J36.SI',
-            'Hongkong Land': 'H78.SI',
-            'ST Engineering': 'S63.SI',
-            'Ascendas REIT': 'A17U.SI',
-            'CapitaLand Mall Trust': 'C38U.SI',
-            'Mapletree Logistics Trust': 'M44U.SI',
-            'Venture Corp': 'V03.SI'
-        }
-        
-        self.results = []
-    
-    def calculate_rsi(self, prices, period=14):
-        """Calculate Relative Strength Index"""
+# One pooled HTTP session for every Yahoo Finance request, so connections and
+# TLS handshakes are reused. Newer yfinance releases expect a curl_cffi session.
+try:
+    from curl_cffi import requests as curl_requests
+    HTTP_SESSION = curl_requests.Session(impersonate='chrome')
+except ImportError:
+    import requests
+    HTTP_SESSION = requests.Session()
+
+# Major SGX stocks with their tickers (sample list), shared with the dashboard
+SGX_TICKERS = MappingProxyType({
+    'DBS Group Holdings': 'D05.SI',
+    'OCBC Bank': 'O39.SI',
+    'United Overseas Bank': 'U11.SI',
+    'Singapore Airlines': 'C6L.SI',
+    'Singtel': 'Z74.SI',
+    'CapitaLand Investment': '9CI.SI',
+    'Wilmar International': 'F34.SI',
+    'Genting Singapore': 'G13.SI',
+    'City Developments': 'C09.SI',
+    'Keppel Corp': 'BN4.SI',
+    'ComfortDelGro': 'C52.SI',
+    'SembCorp Industries': 'U96.SI',
+    'Thai Beverage': 'Y92.SI',
+    'Jardine Matheson': 'J36.SI',
+    'Hongkong Land': 'H78.SI',
+    'ST Engineering': 'S63.SI',
+    'Ascendas REIT': 'A17U.SI',
+    'CapitaLand Mall Trust': 'C38U.SI',
+    'Mapletree Logistics Trust': 'M44U.SI',
+    'Venture Corp': 'V03.SI'
+})
+
+# Local Parquet cache of downloaded price history, one file per symbol.
+# Lives beside this file unless SGX_SCREENER_CACHE_DIR says otherwise, with a
+# per-user fallback for installs where the source directory is read-only.
+CACHE_DIR = Path(os.environ.get('SGX_SCREENER_CACHE_DIR', Path(__file__).resolve().parent / 'cache'))
+USER_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'sgx-screener'
+HISTORY_DAYS = 90
+# Slack for weekends and holidays when checking that a cache file covers
+# the start of the window
+CACHE_START_TOLERANCE = timedelta(days=7)
+CHECKED_FILE = 'checked.json'
+
+def _write_atomic(path, write):
+    """Write a file via write(tmp_path) and move it into place, so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _writable_cache_dir(cache_dir):
+    """Return the first of cache_dir and USER_CACHE_DIR that can be written to, or None"""
+    for candidate in (Path(cache_dir), USER_CACHE_DIR):
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            result = rsi.iloc[-1]
-            return float(result) if not pd.isna(result) else 50.0
-        except:
-            return 50.0
+            candidate.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            continue
+        if os.access(candidate, os.W_OK):
+            return candidate
     
-    def calculate_moving_averages(self, prices):
-        """Calculate moving averages"""
+    print("No writable cache directory; prices will not be cached")
+    return None
+
+def load_price_history(symbols, cache_dir=CACHE_DIR, days=HISTORY_DAYS):
+    """Load recent daily price history, only downloading bars missing from the cache
+    
+    Returns a DataFrame grouped by ticker, like yf.download(group_by='ticker').
+    """
+    symbols = list(symbols)
+    cache_dir = _writable_cache_dir(cache_dir)
+    window_start = pd.Timestamp(datetime.now() - timedelta(days=days)).normalize()
+    
+    cached = {}
+    paths = {symbol: cache_dir / f'{symbol}.parquet' for symbol in symbols} if cache_dir else {}
+    for symbol, path in paths.items():
+        if path.exists():
+            try:
+                cached[symbol] = pd.read_parquet(path)
+            except (OSError, ValueError):
+                print(f"Ignoring unreadable cache file {path}")
+    
+    # Symbol -> (from, through): the span already asked of Yahoo Finance. This
+    # vouches for price files with no bars (delisted) or none near the window
+    # start (recent listings, suspensions), which would otherwise be refetched
+    checked_path = cache_dir / CHECKED_FILE if cache_dir else None
+    checked = {}
+    if checked_path is not None and checked_path.exists():
         try:
-            ma20 = float(prices.rolling(window=20).mean().iloc[-1])
-            ma50 = float(prices.rolling(window=50).mean().iloc[-1])
-            current_price = float(prices.iloc[-1])
-            
-            return {
-                'ma20': ma20,
-                'ma50': ma50,
-                'current_price': current_price,
-                'price_above_ma20': current_price > ma20,
-                'price_above_ma50': current_price > ma50,
-                'ma20_above_ma50': ma20 > ma50
-            }
-        except:
-            current_price = float(prices.iloc[-1])
-            return {
-                'ma20': current_price,
-                'ma50': current_price,
-                'current_price': current_price,
-                'price_above_ma20': True,
-                'price_above_ma50': True,
-                'ma20_above_ma50': True
+            checked = {
+                symbol: tuple(pd.Timestamp(day) for day in span)
+                for symbol, span in json.loads(checked_path.read_text()).items()
             }
+        except (OSError, ValueError, TypeError):
+            print(f"Ignoring unreadable cache file {checked_path}")
     
-    def calculate_momentum(self, prices):
-        """Calculate price momentum over different periods"""
-        try:
-            current = float(prices.iloc[-1])
-            
-            mom_5d = ((current / float(prices.iloc[-5])) - 1) * 100 if len(prices) >= 5 else 0
-            mom_20d = ((current / float(prices.iloc[-20])) - 1) * 100 if len(prices) >= 20 else 0
-            mom_50d = ((current / float(prices.iloc[-50])) - 1) * 100 if len(prices) >= 50 else 0
+    # Re-request the last cached bar as well, since it may have been
+    # downloaded while that trading day was still in progress. A symbol whose
+    # head was never fetched is downloaded from the start of the window.
+    covered = window_start + CACHE_START_TOLERANCE
+    groups = {}
+    for symbol in symbols:
+        history = cached.get(symbol)
+        has_bars = history is not None and not history.empty
+        # A record only counts while the price file it describes still exists
+        span = checked.get(symbol) if history is not None else None
+        if not ((has_bars and history.index[0] <= covered) or (span and span[0] <= covered)):
+            start = window_start
+        elif has_bars:
+            start = max(history.index[-1], window_start)
+        else:
+            start = max(span[1], window_start)
+        groups.setdefault(start, []).append(symbol)
+    
+    # One batched request per start date, so a symbol that needs a long
+    # backfill doesn't drag every other ticker back to the window start
+    downloads = {
+        start: yf.download(
+            group, start=start, group_by='ticker', threads=True,
+            auto_adjust=False, progress=False, session=HTTP_SESSION
+        )
+        for start, group in groups.items()
+    }
+    
+    frames = {}
+    fetched_any = False
+    for start, group in groups.items():
+        data = downloads[start]
+        downloaded = set(data.columns.get_level_values(0))
+        for symbol in group:
+            history = cached.get(symbol)
+            if symbol in downloaded:
+                new_rows = data[symbol].dropna(how='all')
+                if not new_rows.empty:
+                    fetched_any = True
+                    history = new_rows if history is None or history.empty else pd.concat([history, new_rows])
+                    history = history[~history.index.duplicated(keep='last')].sort_index()
+                    history = history[history.index >= window_start]
+                    if symbol in paths:
+                        try:
+                            _write_atomic(paths[symbol], history.to_parquet)
+                        except OSError as e:
+                            print(f"Could not cache {symbol}: {e}")
             
-            return {
-                'momentum_5d': mom_5d,
-                'momentum_20d': mom_20d,
-                'momentum_50d': mom_50d
-            }
-        except:
-            return {
-                'momentum_5d': 0,
-                'momentum_20d': 0,
-                'momentum_50d': 0
-            }
+            if history is not None:
+                history = history[history.index >= window_start]
+                if not history.empty:
+                    frames[symbol] = history
     
-    def calculate_volume_analysis(self, volume):
-        """Analyze volume trends"""
+    # An empty result for every symbol more likely means the requests failed
+    # than that nothing traded, so only a run that got some bars counts as a
+    # check. Symbols that returned nothing get an empty price file to match.
+    if checked_path is not None and fetched_any:
+        today = pd.Timestamp(datetime.now()).normalize()
+        for start, group in groups.items():
+            for symbol in group:
+                checked_from = checked.get(symbol, (start,))[0]
+                checked[symbol] = (min(checked_from, start), today)
+                if not paths[symbol].exists():
+                    try:
+                        _write_atomic(paths[symbol], pd.DataFrame(index=pd.DatetimeIndex([])).to_parquet)
+                    except OSError as e:
+                        print(f"Could not cache {symbol}: {e}")
+        spans = {symbol: [day.strftime('%Y-%m-%d') for day in span] for symbol, span in checked.items()}
         try:
-            avg_volume = float(volume.rolling(window=20).mean().iloc[-1])
-            current_volume = float(volume.iloc[-1])
-            volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
-            
-            return {
-                'avg_volume': avg_volume,
-                'current_volume': current_volume,
-                'volume_ratio': volume_ratio,
-                'high_volume': volume_ratio > 1.5
-            }
-        except:
-            return {
-                'avg_volume': 1000000,
-                'current_volume': 1000000,
-                'volume_ratio': 1.0,
-                'high_volume': False
-            }
+            _write_atomic(checked_path, lambda tmp_path: Path(tmp_path).write_text(json.dumps(spans)))
+        except OSError as e:
+            print(f"Could not cache download dates: {e}")
     
-    def calculate_score(self, indicators):
-        """Calculate overall stock score (0-100)"""
-        score = 0
+    return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+@njit(cache=True)
+def rsi_last(close, period=14):
+    """Latest RSI using Wilder smoothing, computed in a single pass (NaN if undefined)"""
+    n = close.shape[0]
+    if n <= period:
+        return np.nan
+    
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if i <= period:
+            # Seed with the simple average of the first `period` changes
+            avg_gain += gain / period
+            avg_loss += loss / period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+    
+    if avg_gain + avg_loss == 0.0:
+        return np.nan
+    return 100.0 * avg_gain / (avg_gain + avg_loss)
+
+@njit(parallel=True, cache=True, fastmath={'nsz', 'arcp', 'contract', 'reassoc'})
+def compute_all(closes, volumes, rsi_period=14):
+    """Latest indicators for every column of (days x tickers) close and volume matrices
+    
+    Tickers are processed in parallel, each over its own non-missing bars.
+    fastmath leaves out 'nnan' because missing bars are detected with isnan.
+    Returns per-ticker arrays: (bars, price, rsi, ma20, ma50, momentum_5d,
+    momentum_20d, momentum_50d, volume_ratio, volatility).
+    """
+    n_rows, n_tickers = closes.shape
+    bars = np.zeros(n_tickers, dtype=np.int64)
+    price = np.full(n_tickers, np.nan)
+    rsi = np.full(n_tickers, np.nan)
+    ma20 = np.full(n_tickers, np.nan)
+    ma50 = np.full(n_tickers, np.nan)
+    mom_5d = np.zeros(n_tickers)
+    mom_20d = np.zeros(n_tickers)
+    mom_50d = np.zeros(n_tickers)
+    volume_ratio = np.ones(n_tickers)
+    volatility = np.full(n_tickers, np.nan)
+    
+    for j in prange(n_tickers):
+        # Gather this ticker's trading days; a missing volume counts as none traded
+        close = np.empty(n_rows)
+        volume = np.empty(n_rows)
+        n = 0
+        for i in range(n_rows):
+            if not np.isnan(closes[i, j]):
+                close[n] = closes[i, j]
+                volume[n] = 0.0 if np.isnan(volumes[i, j]) else volumes[i, j]
+                n += 1
+        bars[j] = n
+        if n == 0:
+            continue
         
-        # RSI scoring (30-70 is good range)
-        rsi = indicators['rsi']
-        if 30 <= rsi <= 70:
-            score += 20
-        elif rsi < 30:  # Oversold might be opportunity
-            score += 15
-        else:  # Overbought
-            score += 5
+        current = close[n - 1]
+        price[j] = current
+        rsi[j] = rsi_last(close[:n], rsi_period)
         
-        # Moving average scoring
-        if indicators['price_above_ma20']:
-            score += 15
-        if indicators['price_above_ma50']:
-            score += 15
-        if indicators['ma20_above_ma50']:
-            score += 10
+        # Trailing 20/50-bar sums in one backward sweep
+        sum20 = 0.0
+        sum50 = 0.0
+        volume_sum20 = 0.0
+        for k in range(min(n, 50)):
+            sum50 += close[n - 1 - k]
+            if k < 20:
+                sum20 += close[n - 1 - k]
+                volume_sum20 += volume[n - 1 - k]
+        if n >= 20:
+            ma20[j] = sum20 / 20
+        if n >= 50:
+            ma50[j] = sum50 / 50
         
-        # Momentum scoring
-        mom_20d = indicators['momentum_20d']
-        if mom_20d > 5:
-            score += 15
-        elif mom_20d > 0:
-            score += 10
-        elif mom_20d > -5:
-            score += 5
+        if n >= 5:
+            mom_5d[j] = (current / close[n - 5] - 1) * 100
+        if n >= 20:
+            mom_20d[j] = (current / close[n - 20] - 1) * 100
+        if n >= 50:
+            mom_50d[j] = (current / close[n - 50] - 1) * 100
+        
+        avg_volume = volume_sum20 / min(n, 20)
+        if avg_volume > 0:
+            volume_ratio[j] = volume[n - 1] / avg_volume
+        
+        # Annualized volatility (%) of daily returns, via Welford's running variance
+        mean = 0.0
+        m2 = 0.0
+        for k in range(1, n):
+            ret = close[k] / close[k - 1] - 1
+            diff = ret - mean
+            mean += diff / k
+            m2 += diff * (ret - mean)
+        if n > 2:
+            volatility[j] = np.sqrt(m2 / (n - 2)) * np.sqrt(252) * 100
+    
+    return bars, price, rsi, ma20, ma50, mom_5d, mom_20d, mom_50d, volume_ratio, volatility
+
+def price_arrays(data):
+    """Unpack a ticker-grouped price frame into plain NumPy arrays
+    
+    Returns (closes, volumes, symbols, dates), where closes and volumes are
+    (days x tickers) float32 matrices in column-major order, so each ticker's
+    history is contiguous for compute_all(). Both are read-only, as the
+    dashboard shares one copy between sessions.
+    """
+    if data.empty:
+        closes = np.empty((0, 0), dtype=np.float32, order='F')
+        volumes = closes.copy(order='F')
+        symbols, dates = [], pd.DatetimeIndex([])
+    else:
+        close_frame = data.xs('Close', axis=1, level=1)
+        symbols, dates = list(close_frame.columns), close_frame.index
+        closes = np.asfortranarray(close_frame.to_numpy(dtype=np.float32))
+        volumes = np.asfortranarray(
+            data.xs('Volume', axis=1, level=1)[symbols].to_numpy(dtype=np.float32)
+        )
+    
+    closes.flags.writeable = volumes.flags.writeable = False
+    return closes, volumes, symbols, dates
+
+def compute_indicators(closes, volumes, symbols, dates, rsi_period=14, min_days=20):
+    """Calculate the latest indicators for every ticker in one fused kernel pass
+    
+    Takes the arrays returned by price_arrays(). Returns one row per ticker
+    with at least min_days of prices, indexed by symbol.
+    """
+    if closes.size == 0:
+        return pd.DataFrame()
+    
+    (bars, price, rsi, ma20, ma50, mom_5d, mom_20d, mom_50d,
+     volume_ratio, volatility) = compute_all(closes, volumes, rsi_period)
+    
+    # First and last trading day each ticker has a close for
+    traded = ~np.isnan(closes)
+    first_day = traded.argmax(axis=0)
+    last_day = len(dates) - 1 - traded[::-1].argmax(axis=0)
+    
+    indicators = pd.DataFrame({
+        'current_price': price,
+        'rsi': np.where(np.isnan(rsi), 50.0, rsi),
+        'ma20': ma20,
+        'ma50': ma50,
+        'price_above_ma20': price > ma20,
+        'price_above_ma50': price > ma50,
+        'ma20_above_ma50': ma20 > ma50,
+        'momentum_5d': mom_5d,
+        'momentum_20d': mom_20d,
+        'momentum_50d': mom_50d,
+        'volume_ratio': volume_ratio,
+        'high_volume': volume_ratio > 1.5,
+        'volatility': volatility,
+        'data_start': dates[first_day],
+        'data_end': dates[last_day]
+    }, index=pd.Index(symbols, name='symbol'))
+    
+    return indicators[bars >= min_days]
+
+class SGXStockScreener:
+    def __init__(self):
+        self.sgx_stocks = SGX_TICKERS
         
-        # Volume scoring
-        if indicators['high_volume'] and indicators['momentum_5d'] > 0:
-            score += 10
-        elif indicators['volume_ratio'] > 1.2:
-            score += 5
+        self.results = []
+        self.df = pd.DataFrame()
+    
+    def calculate_score(self, indicators):
+        """Calculate overall stock score (0-100)
         
-        # Volatility bonus (moderate volatility preferred)
-        if 2 <= abs(indicators['momentum_5d']) <= 8:
-            score += 15
+        Accepts one stock's indicators or a DataFrame of them, scoring every
+        row at once with boolean masks rather than per-stock branches.
+        """
+        rsi = indicators['rsi']
+        mom_5d = indicators['momentum_5d']
+        mom_20d = indicators['momentum_20d']
         
-        return min(score, 100)  # Cap at 100
+        score = (
+            # RSI scoring (30-70 is good range, oversold might be opportunity)
+            np.select([(rsi >= 30) & (rsi <= 70), rsi < 30], [20, 15], 5)
+            
+            # Moving average scoring
+            + 15 * indicators['price_above_ma20']
+            + 15 * indicators['price_above_ma50']
+            + 10 * indicators['ma20_above_ma50']
+            
+            # Momentum scoring
+            + np.select([mom_20d > 5, mom_20d > 0, mom_20d > -5], [15, 10, 5], 0)
+            
+            # Volume scoring
+            + np.select(
+                [indicators['high_volume'] & (mom_5d > 0), indicators['volume_ratio'] > 1.2],
+                [10, 5], 0
+            )
+            
+            # Volatility bonus (moderate volatility preferred)
+            + 15 * ((abs(mom_5d) >= 2) & (abs(mom_5d) <= 8))
+        )
+        
+        return np.minimum(score, 100)  # Cap at 100
     
-    def analyze_stock(self, symbol, name):
-        """Analyze a single stock"""
+    def analyze_stock(self, stock, symbol, name):
+        """Analyze a single stock from its downloaded price history
+        
+        stock holds one ticker's daily bars with Close and Volume columns, either
+        flat or with the (Price, Ticker) columns yf.download(symbol) returns.
+        """
         try:
             print(f"Analyzing {name} ({symbol})...")
             
-            # Download 3 months of data
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=90)
+            if isinstance(stock.columns, pd.MultiIndex):
+                stock = stock.droplevel('Ticker', axis=1)
             
-            stock = yf.download(symbol, start=start_date, end=end_date, progress=False)
+            # Same kernels as screen_stocks, run on a one-ticker batch
+            data = pd.concat({symbol: stock[['Close', 'Volume']]}, axis=1)
+            indicators = compute_indicators(*price_arrays(data))
             
-            if stock.empty or len(stock) < 20:
+            if indicators.empty:
                 print(f"Insufficient data for {name}")
                 return None
             
-            # Calculate indicators
-            prices = stock['Close']
-            volume = stock['Volume']
-            
-            rsi = self.calculate_rsi(prices)
-            ma_data = self.calculate_moving_averages(prices)
-            momentum = self.calculate_momentum(prices)
-            volume_data = self.calculate_volume_analysis(volume)
-            
-            # Combine all indicators
-            indicators = {
-                'symbol': symbol,
-                'name': name,
-                'current_price': ma_data['current_price'],
-                'rsi': rsi,
-                'ma20': ma_data['ma20'],
-                'ma50': ma_data['ma50'],
-                'price_above_ma20': ma_data['price_above_ma20'],
-                'price_above_ma50': ma_data['price_above_ma50'],
-                'ma20_above_ma50': ma_data['ma20_above_ma50'],
-                'momentum_5d': momentum['momentum_5d'],
-                'momentum_20d': momentum['momentum_20d'],
-                'momentum_50d': momentum['momentum_50d'],
-                'volume_ratio': volume_data['volume_ratio'],
-                'high_volume': volume_data['high_volume']
-            }
-            
-            # Calculate overall score
-            indicators['score'] = self.calculate_score(indicators)
+            indicators.insert(0, 'name', name)
+            indicators['score'] = self.calculate_score(indicators).astype(int)
             
-            return indicators
+            # One record of native Python values
+            return indicators.reset_index().astype(object).to_dict('records')[0]
             
         except Exception as e:
             print(f"Error analyzing {name}: {str(e)}")
@@ -218,30 +434,39 @@ class SGXStockScreener:
         print("Starting SGX Stock Screening...")
         print("=" * 50)
         
+        # 3 months of data for every ticker, topped up from the local cache
+        data = load_price_history(self.sgx_stocks.values())
+        indicators = compute_indicators(*price_arrays(data))
+        
         for name, symbol in self.sgx_stocks.items():
-            result = self.analyze_stock(symbol, name)
-            if result:
-                self.results.append(result)
-            
-            # Small delay to avoid overwhelming the API
-            time.sleep(0.5)
+            if symbol not in indicators.index:
+                print(f"Insufficient data for {name}")
+        
+        if indicators.empty:
+            return self.results
+        
+        names = {symbol: name for name, symbol in self.sgx_stocks.items()}
+        indicators.insert(0, 'name', indicators.index.map(names))
+        indicators['score'] = self.calculate_score(indicators).astype(int)
         
         # Sort by score (highest first)
-        self.results = sorted(self.results, key=lambda x: x['score'], reverse=True)
+        self.df = (
+            indicators.reset_index()
+            .sort_values('score', ascending=False, kind='stable')
+            .reset_index(drop=True)
+        )
+        self.results = self.df.to_dict('records')
         
         return self.results
     
     def create_report(self):
         """Create and save screening report"""
-        if not self.results:
+        if self.df.empty:
             print("No results to report")
             return
         
-        # Convert to DataFrame
-        df = pd.DataFrame(self.results)
-        
         # Select and rename columns for report
-        report_df = df[[
+        report_df = self.df[[
             'name', 'symbol', 'current_price', 'score', 'rsi',
             'momentum_5d', 'momentum_20d', 'momentum_50d',
             'price_above_ma20', 'price_above_ma50', 'volume_ratio'
@@ -254,16 +479,14 @@ class SGXStockScreener:
         ]
         
         # Round numerical columns
-        report_df['Price (SGD)'] = report_df['Price (SGD)'].round(2)
-        report_df['RSI'] = report_df['RSI'].round(1)
-        report_df['5D Momentum (%)'] = report_df['5D Momentum (%)'].round(1)
-        report_df['20D Momentum (%)'] = report_df['20D Momentum (%)'].round(1)
-        report_df['50D Momentum (%)'] = report_df['50D Momentum (%)'].round(1)
-        report_df['Volume Ratio'] = report_df['Volume Ratio'].round(2)
+        report_df = report_df.round({
+            'Price (SGD)': 2, 'RSI': 1, '5D Momentum (%)': 1,
+            '20D Momentum (%)': 1, '50D Momentum (%)': 1, 'Volume Ratio': 2
+        })
         
         # Save to Excel
         filename = f'SGX_Stock_Screen_{datetime.now().strftime("%Y%m%d")}.xlsx'
-        report_df.to_excel(filename, index=False)
+        report_df.to_excel(filename, index=False, engine='xlsxwriter')
         
         print(f"\nReport saved as: {filename}")
         print("\nTop 5 Stocks by Score:")
@@ -277,6 +500,19 @@ class SGXStockScreener:
         
         return report_df
 
+def _warmup():
+    """Compile the Numba kernels up front so the first screening run doesn't pay the JIT cost
+    
+    The dummy inputs match the dtypes and layout used at runtime, so the
+    compiled (and disk-cached) specializations are the ones actually called;
+    compute_all() also compiles the float64 rsi_last() it calls internally.
+    """
+    dummy = np.asfortranarray(np.linspace(1, 2, 120, dtype=np.float32).reshape(60, 2))
+    dummy.flags.writeable = False
+    compute_all(dummy, dummy, 14)
+
+_warmup()
+
 def main():
     """Main execution function"""
     print("SGX Stock Screener")
@@ -4,11 +4,11 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import time
+from sgx_screener import SGX_TICKERS, compute_indicators, load_price_history, price_arrays
 
 # Configure page
 st.set_page_config(
@@ -42,109 +42,78 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Helper Functions
-@st.cache_data(ttl=None, show_spinner=False)  # Cache until manually cleared or date changes
-def load_stock_data():
-    """Load the latest stock screening data"""
-    # Check if we need to refresh based on date
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    # SGX stocks dictionary
-    sgx_stocks = {
-        'DBS Group Holdings': 'D05.SI',
-        'OCBC Bank': 'O39.SI',
-        'United Overseas Bank': 'U11.SI',
-        'Singapore Airlines': 'C6L.SI',
-        'Singtel': 'Z74.SI',
-        'CapitaLand Investment': '9CI.SI',
-        'Wilmar International': 'F34.SI',
-        'Genting Singapore': 'G13.SI',
-        'City Developments': 'C09.SI',
-        'Keppel Corp': 'BN4.SI'
-    }
+def score_stocks(df):
+    """Score every stock's indicators at once (0-100)"""
+    # Better scoring system - no base score, earn points only for positive signals
+    score = (
+        20 * df['Above_MA20']  # Strong signal
+        + 20 * df['Above_MA50']  # Strong signal
+        + 15 * (df['MA20'] > df['MA50'])  # Building momentum
+        + np.select([df['Momentum_20D'] > 5, df['Momentum_20D'] > 0], [20, 10], 0)  # Strong / modest recent gains
+        + 15 * df['RSI'].between(30, 70)  # Healthy RSI
+        + 10 * (df['Volume_Ratio'] > 1.2)  # Above average interest
+    )
+    return score.clip(upper=100)
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_price_arrays(cache_key):
+    """Download prices once and keep them as NumPy arrays shared across reruns and sessions"""
+    return price_arrays(load_price_history(SGX_TICKERS.values()))
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Re-check for new bars at most hourly
+def load_stock_data(cache_key):
+    """Load the latest stock screening data
     
-    results = []
+    cache_key is today's date, so cached results never outlive the trading day.
+    """
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    # Track the actual data date range
-    data_start_date = None
-    data_end_date = None
+    # 3 months of data for every ticker; only bars missing from the local cache are downloaded
+    status_text.text(f'Downloading {len(SGX_TICKERS)} stocks...')
+    closes, volumes, symbols, dates = get_price_arrays(cache_key)
+    progress_bar.progress(0.5)
     
-    for i, (name, symbol) in enumerate(sgx_stocks.items()):
-        status_text.text(f'Loading {name}...')
-        try:
-            stock = yf.download(symbol, period="3mo", progress=False)
-            if not stock.empty and len(stock) >= 20:
-                
-                # Track actual data dates
-                if data_start_date is None:
-                    data_start_date = stock.index[0].strftime("%Y-%m-%d")
-                    data_end_date = stock.index[-1].strftime("%Y-%m-%d")
-                
-                # Simple calculations
-                current_price = float(stock['Close'].iloc[-1])
-                ma20 = float(stock['Close'].rolling(20).mean().iloc[-1])
-                ma50 = float(stock['Close'].rolling(50).mean().iloc[-1])
-                
-                # Momentum calculations
-                mom_5d = ((current_price / float(stock['Close'].iloc[-5])) - 1) * 100 if len(stock) >= 5 else 0
-                mom_20d = ((current_price / float(stock['Close'].iloc[-20])) - 1) * 100 if len(stock) >= 20 else 0
-                
-                # Calculate volatility (for risk assessment)
-                daily_returns = stock['Close'].pct_change().dropna()
-                volatility = daily_returns.std() * np.sqrt(252) * 100  # Annualized volatility %
-                
-                # RSI calculation
-                delta = stock['Close'].diff()
-                gain = delta.where(delta > 0, 0).rolling(14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-                rs = gain / loss
-                rsi = float((100 - (100 / (1 + rs))).iloc[-1])
-                
-                # Volume analysis
-                avg_volume = float(stock['Volume'].rolling(20).mean().iloc[-1])
-                current_volume = float(stock['Volume'].iloc[-1])
-                volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
-                
-                # Better scoring system - start from 0
-                score = 0  # No base score - earn points only for positive signals
-                if current_price > ma20: score += 20  # Strong signal
-                if current_price > ma50: score += 20  # Strong signal  
-                if ma20 > ma50: score += 15  # Building momentum
-                if mom_20d > 5: score += 20  # Strong recent gains
-                elif mom_20d > 0: score += 10  # Modest gains
-                if 30 <= rsi <= 70: score += 15  # Healthy RSI
-                if volume_ratio > 1.2: score += 10  # Above average interest
-                
-                results.append({
-                    'Company': name,
-                    'Symbol': symbol,
-                    'Price': current_price,
-                    'Score': min(score, 100),
-                    'RSI': rsi,
-                    'Momentum_5D': mom_5d,
-                    'Momentum_20D': mom_20d,
-                    'MA20': ma20,
-                    'MA50': ma50,
-                    'Above_MA20': current_price > ma20,
-                    'Above_MA50': current_price > ma50,
-                    'Volume_Ratio': volume_ratio,
-                    'Volatility': volatility,  # Add volatility for risk calculation
-                    'Trend': 'Uptrend' if (current_price > ma20 and ma20 > ma50) else 'Downtrend',
-                    'Data_Start': data_start_date,
-                    'Data_End': data_end_date
-                })
-        except:
-            pass
-        
-        progress_bar.progress((i + 1) / len(sgx_stocks))
+    status_text.text('Calculating indicators...')
+    indicators = compute_indicators(closes, volumes, symbols, dates)
+    progress_bar.progress(1.0)
     
     status_text.text('Data loaded successfully!')
     progress_bar.empty()
     status_text.empty()
     
-    df = pd.DataFrame(results)
-    return df.sort_values('Score', ascending=False) if not df.empty else pd.DataFrame()
+    if indicators.empty:
+        return pd.DataFrame()
+    
+    names = {symbol: name for name, symbol in SGX_TICKERS.items()}
+    df = pd.DataFrame({
+        'Company': indicators.index.map(names),
+        'Symbol': indicators.index,
+        'Price': indicators['current_price'],
+        'RSI': indicators['rsi'],
+        'Momentum_5D': indicators['momentum_5d'],
+        'Momentum_20D': indicators['momentum_20d'],
+        'MA20': indicators['ma20'],
+        'MA50': indicators['ma50'],
+        'Above_MA20': indicators['price_above_ma20'],
+        'Above_MA50': indicators['price_above_ma50'],
+        'Volume_Ratio': indicators['volume_ratio'],
+        'Volatility': indicators['volatility'],  # Add volatility for risk calculation
+        'Trend': np.where(indicators['price_above_ma20'] & indicators['ma20_above_ma50'], 'Uptrend', 'Downtrend'),
+        'Data_Start': indicators['data_start'].dt.strftime("%Y-%m-%d"),
+        'Data_End': indicators['data_end'].dt.strftime("%Y-%m-%d")
+    })
+    df.insert(3, 'Score', score_stocks(df))
+    
+    return df.sort_values('Score', ascending=False).reset_index(drop=True)
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def apply_filters(df, min_score, trend_filter):
+    """Filter the screening results by minimum score and trend"""
+    mask = df['Score'] >= min_score
+    if trend_filter != "All":
+        mask &= df['Trend'] == trend_filter
+    return df[mask]
 
 def get_score_color(score):
     """Return color based on score"""
@@ -213,10 +182,12 @@ def main():
     st.markdown("---")
     
     if st.button("🔄 Refresh Data", type="primary"):
-        st.cache_data.clear()
+        get_price_arrays.clear()
+        load_stock_data.clear()
     
+    # Widget reruns reuse the cached data; a new day or the refresh button reloads it
     with st.spinner("Loading latest stock data..."):
-        df = load_stock_data()
+        df = load_stock_data(datetime.now().strftime("%Y-%m-%d"))
     
     if df.empty:
         st.error("Unable to load stock data. Please check your internet connection and try again.")
@@ -337,9 +308,7 @@ def main():
         trend_filter = st.selectbox("Trend Filter", ["All", "Uptrend", "Downtrend"])
     
     # Filter data
-    filtered_df = df[df['Score'] >= min_score]
-    if trend_filter != "All":
-        filtered_df = filtered_df[filtered_df['Trend'] == trend_filter]
+    filtered_df = apply_filters(df, min_score, trend_filter)
     
     # Display filtered data
     if not filtered_df.empty:
@@ -348,9 +317,7 @@ def main():
         # Create display dataframe
         display_df = filtered_df[['Company', 'Price', 'Score', 'Momentum_20D', 'RSI', 'Trend']].copy()
         display_df.columns = ['Company', 'Price (SGD)', 'Score', '20D Return (%)', 'RSI', 'Trend']
-        display_df['Price (SGD)'] = display_df['Price (SGD)'].round(2)
-        display_df['20D Return (%)'] = display_df['20D Return (%)'].round(1)
-        display_df['RSI'] = display_df['RSI'].round(1)
+        display_df = display_df.round({'Price (SGD)': 2, '20D Return (%)': 1, 'RSI': 1})
         
         st.dataframe(
             display_df,